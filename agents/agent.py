@@ -1,81 +1,157 @@
 import os
+import json
 import time
 import asyncio
-import requests
+import anyio
+import httpx
 from mcp.client.session import ClientSession
 from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.exceptions import McpError
 from conversation import Conversation
 
 MCP_URL = os.environ.get("MCP_URL", "http://localhost:8080/mcp")
 TASK_PROMPT_NAME = os.environ.get("TASK_PROMPT_NAME", "complete_tasks_prompt")
 
+# Reuse one keep-alive connection for liveness probes instead of a fresh
+# DNS + TCP + TLS handshake per poll; the async client keeps the event
+# loop responsive while a probe is connecting or timing out.
+_HTTP = httpx.AsyncClient(timeout=0.5)
+
+# Cleaned tool schemas keyed by a stable hash of their content; tool schemas
+# are static per server version, so the strip work only happens once each.
+# Cached entries are shared — treat them as read-only.
+_SCHEMA_CACHE: dict[str, dict] = {}
+
+
+# Failures that mean "the server went away" — these send us back to the
+# wait loop. Anything else (model errors, bugs) should crash loudly.
+_CONNECTION_ERRORS = (
+    httpx.HTTPError,
+    McpError,
+    OSError,
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+)
+
+
+def _clean_schema(schema: dict) -> dict:
+    key = json.dumps(schema, sort_keys=True)
+    cached = _SCHEMA_CACHE.get(key)
+    if cached is None:
+        cached = _SCHEMA_CACHE[key] = {
+            k: v for k, v in schema.items()
+            if k not in ("additionalProperties", "$schema", "title")
+        }
+    return cached
+
+
+async def bootstrap(session: ClientSession):
+    """Fetch the task prompt and cleaned tool schemas once per connection."""
+    prompt_res = await session.get_prompt(TASK_PROMPT_NAME)
+    prompt = prompt_res.messages[0].content.text  # type: ignore
+
+    tools = (await session.list_tools()).tools
+    tools_json = []
+    for tool in tools:
+        schema = tool.inputSchema
+        if isinstance(schema, dict):
+            schema = _clean_schema(schema)
+        tools_json.append({
+            "name": tool.name,
+            "description": tool.description,
+            "input_schema": schema
+        })
+    return prompt, tools_json
+
+
+def _queue_exhausted(tool_name: str, content: list) -> bool:
+    """True when a next_task/submit_and_next result reports no task left."""
+    if tool_name not in ("next_task", "submit_and_next"):
+        return False
+    texts = [b.get("text") for b in content if b.get("type") == "text"]
+    if tool_name == "next_task":
+        return not texts or all(t in (None, "", "null") for t in texts)
+    for t in texts:
+        try:
+            obj = json.loads(t)
+        except (TypeError, ValueError):
+            continue
+        if isinstance(obj, dict) and "next" in obj:
+            return obj["next"] is None
+    return False
+
+
+async def run_batch(session: ClientSession, prompt: str, tools_json: list) -> bool:
+    """Run one conversation; returns True once the queue reported empty."""
+    exhausted = False
+
+    # Conversation loop
+    convo = Conversation(tools=tools_json)
+    res = convo.add_message(prompt)
+    tool_call = res["tool_call"]
+
+    while tool_call:
+        # Call tool
+        result = await session.call_tool(tool_call.name, tool_call.input)
+
+        # Serialize content; exclude unwanted fields up front so they are
+        # never materialized, and drop nulls to shrink the payload
+        clean_content = [
+            block.model_dump(mode="json", exclude={"annotations", "meta"}, exclude_none=True)
+            for block in result.content
+        ]
+        if _queue_exhausted(tool_call.name, clean_content):
+            exhausted = True
+
+        res = convo.add_tool_result(tool_call.id, clean_content)
+        tool_call = res["tool_call"]
+
+    return exhausted
+
 
 async def perform_tasks():
+    # One connection + initialize/list_tools handshake amortized over every
+    # batch run against this server instance. Batches repeat on the same
+    # session until the queue reports empty or the server goes away (the
+    # latter surfaces as a connection error the caller handles).
     async with streamablehttp_client(MCP_URL) as (read_stream, write_stream, _):
         async with ClientSession(read_stream, write_stream) as session:
             await session.initialize()
+            prompt, tools_json = await bootstrap(session)
+            while not await run_batch(session, prompt, tools_json):
+                pass
+            print("Task queue exhausted.")
+
 
-            # Get prompt
-            prompt_res = await session.get_prompt(TASK_PROMPT_NAME)
-            prompt = prompt_res.messages[0].content.text  # type: ignore
-
-            # Get tools + clean schemas
-            tools = (await session.list_tools()).tools
-            tools_json = []
-            for tool in tools:
-                schema = tool.inputSchema
-                if isinstance(schema, dict):
-                    schema = {
-                        k: v for k, v in schema.items()
-                        if k not in ("additionalProperties", "$schema", "title")
-                    }
-                tools_json.append({
-                    "name": tool.name,
-                    "description": tool.description,
-                    "input_schema": schema
-                })
-
-            # Conversation loop
-            convo = Conversation(tools=tools_json)
-            res = convo.add_message(prompt)
-            tool_call = res["tool_call"]
-
-            while tool_call:
-                # Call tool
-                result = await session.call_tool(tool_call.name, tool_call.input)
-
-                # Serialize content
-                clean_content = []
-                for block in result.content:
-                    content = block.model_dump()
-                    content.pop("annotations", None)
-                    content.pop("meta", None)
-                    clean_content.append(content)
-
-                res = convo.add_tool_result(tool_call.id, clean_content)
-                tool_call = res["tool_call"]
-
-
-def ping(url: str) -> bool:
+async def ping(url: str) -> bool:
     try:
-        requests.get(url)
-        return True
-    except requests.exceptions.RequestException:
+        # HEAD skips the body; the reused client skips the handshake.
+        return (await _HTTP.head(url)).status_code < 500
+    except httpx.HTTPError:
         return False
 
 
 async def run_loop():
     waiting_secs = 0.0
+    delay = 1.0
     while True:
         start_time = time.time()
-        if not ping(MCP_URL):
+        if not await ping(MCP_URL):
             print("\033[A\033[K" + f"Waiting for MCP server... ({int(waiting_secs)}s)")
-            await asyncio.sleep(1)
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.5, 5.0)
             waiting_secs += time.time() - start_time
         else:
             print("MCP server running, performing tasks...")
-            await perform_tasks()
+            try:
+                await perform_tasks()
+            # except* also matches naked exceptions, and the mcp client can
+            # surface stream failures wrapped in an ExceptionGroup; anything
+            # non-connection (model errors, bugs) still crashes loudly
+            except* _CONNECTION_ERRORS as eg:
+                print(f"MCP connection lost: {eg.exceptions[0]}")
             waiting_secs = 0.0
+            delay = 1.0
 
 
 if __name__ == "__main__":
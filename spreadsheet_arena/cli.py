@@ -21,7 +21,7 @@ def _cmd_checkout(args: argparse.Namespace) -> int:
         print("No datasets provided. Try: arena checkout --list")
         return 1
 
-    checkout_many(args.datasets, output_dir=args.output_dir, update=args.update)
+    checkout_many(args.datasets, output_dir=args.output_dir, update=args.update, jobs=args.jobs)
     return 0
 
 
@@ -82,6 +82,7 @@ def _build_parser() -> argparse.ArgumentParser:
     pc.add_argument("--list", action="store_true", help="List available datasets and local cache status.")
     pc.add_argument("--update", action="store_true", help="Force re-download/update of datasets.")
     pc.add_argument("--output-dir", default="datasets", help="Directory to store datasets (default: ./datasets)")
+    pc.add_argument("--jobs", type=int, default=8, help="Max parallel dataset downloads (default: 8)")
     pc.set_defaults(func=_cmd_checkout)
 
     # start
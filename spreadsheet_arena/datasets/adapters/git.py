@@ -1,43 +1,39 @@
 from __future__ import annotations
-import os, shutil, subprocess, tempfile
+import subprocess
 from pathlib import Path
 
 def fetch_git(url: str, ref: str | None, subdir: str | None, tmp_dir: Path) -> Path:
     """
     Clone a git repo shallowly and return the path to either the repo root
     or the requested subdir inside the checkout.
+
+    Uses a blobless partial clone with --no-checkout: when a subdir is
+    requested, a sparse checkout means only that subdir's blobs are ever
+    fetched. Output streams to the terminal (stdout discarded) instead of
+    being buffered in memory.
     """
     repo_dir = tmp_dir / "repo"
-    # Prefer shallow clone
-    subprocess.run(
-        ["git", "clone", "--depth", "1"] + (["--branch", ref] if ref else []) + [url, str(repo_dir)],
-        check=True, capture_output=True
-    )
-    if ref and not _is_branch_or_tag_checked(repo_dir, ref):
-        # Fallback: fetch ref if it's not a branch/tag (e.g., commit SHA)
-        subprocess.run(["git", "-C", str(repo_dir), "fetch", "origin", ref], check=True, capture_output=True)
-        subprocess.run(["git", "-C", str(repo_dir), "checkout", ref], check=True, capture_output=True)
+    base = ["git", "clone", "--depth", "1", "--filter=blob:none", "--no-checkout"]
+    try:
+        _run(base + (["--branch", ref] if ref else []) + [url, str(repo_dir)])
+    except subprocess.CalledProcessError:
+        if not ref:
+            raise
+        # ref is likely a commit SHA rather than a branch/tag: clone the
+        # default branch, then fetch the ref explicitly
+        _run(base + [url, str(repo_dir)])
+        _run(["git", "-C", str(repo_dir), "fetch", "--depth", "1", "origin", ref])
+
+    if subdir:
+        _run(["git", "-C", str(repo_dir), "sparse-checkout", "set", subdir])
+    _run(["git", "-C", str(repo_dir), "checkout", ref or "HEAD"])
 
     root = repo_dir if not subdir else (repo_dir / subdir)
     if not root.exists():
         raise FileNotFoundError(f"subdir '{subdir}' not found in repo {url}")
     return root
 
-def _is_branch_or_tag_checked(repo_dir: Path, ref: str) -> bool:
-    try:
-        out = subprocess.run(["git", "-C", str(repo_dir), "rev-parse", "--abbrev-ref", "HEAD"],
-                             check=True, capture_output=True, text=True)
-        if out.stdout.strip() == ref:
-            return True
-    except Exception:
-        pass
-    try:
-        # Is current commit equal to ref?
-        out = subprocess.run(["git", "-C", str(repo_dir), "rev-parse", "HEAD"],
-                             check=True, capture_output=True, text=True)
-        cur = out.stdout.strip()
-        out2 = subprocess.run(["git", "-C", str(repo_dir), "rev-parse", ref],
-                              check=True, capture_output=True, text=True)
-        return cur == out2.stdout.strip()
-    except Exception:
-        return False
+def _run(args: list[str]) -> None:
+    # stderr stays attached so git errors (and progress, on a tty) are
+    # visible rather than buffered; stdout is noise for these commands
+    subprocess.run(args, check=True, stdout=subprocess.DEVNULL)
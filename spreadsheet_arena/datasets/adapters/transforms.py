@@ -7,6 +7,8 @@ from typing import Dict, List
 from spreadsheet_arena.datasets.utils import ensure_dir
 
 def apply_transforms(root: Path, transforms: List[Dict]) -> None:
+    if not transforms:
+        return
     for step in transforms:
         t = step["type"]
         if t == "unzip":
@@ -39,18 +41,31 @@ def _t_untar(root: Path, step: dict):
 
 def _safe_untar(tar_path: Path, dest: Path):
     with tarfile.open(tar_path, "r:gz") as tf:
-        # Prevent path traversal
-        for m in tf.getmembers():
-            mpath = (dest / m.name).resolve()
-            if not str(mpath).startswith(str(dest.resolve())):
+        if hasattr(tarfile, "data_filter"):
+            # 3.12+ (and late 3.11): traversal/link checks happen inside tarfile
+            tf.extractall(dest, filter="data")
+            return
+        # Prevent path traversal: pure-string check against the destination
+        # prefix, computed once, then hand the validated list to extractall
+        # so members are only iterated once more.
+        dest_s = os.path.realpath(dest) + os.sep
+        members = tf.getmembers()
+        for m in members:
+            target = os.path.normpath(os.path.join(dest_s, m.name))
+            # normpath strips the trailing sep, so a './' root member
+            # normalizes to dest itself — allow it
+            if target != dest_s[:-1] and not target.startswith(dest_s):
                 raise RuntimeError(f"Unsafe tar member path: {m.name}")
-        tf.extractall(dest)
+        tf.extractall(dest, members=members)
 
 def _glob_paths(root: Path, patterns: List[str]) -> List[Path]:
-    out: List[Path] = []
+    # dedupe while streaming: dicts keep insertion order, so no
+    # intermediate list is materialized
+    seen: Dict[Path, None] = {}
     for p in patterns:
-        out.extend(root.rglob(p))
-    return list(dict.fromkeys(out))  # dedupe
+        for path in root.rglob(p):
+            seen[path] = None
+    return list(seen)
 
 def _t_unzip(root: Path, step: Dict):
     for z in _glob_paths(root, step["patterns"]):
@@ -62,29 +77,38 @@ def _t_unzip(root: Path, step: Dict):
 
 def _safe_unzip(zip_path: Path, dest: Path):
     with zipfile.ZipFile(zip_path) as zf:
-        for member in zf.infolist():
-            # prevent Zip Slip
-            extracted = (dest / member.filename).resolve()
-            if not str(extracted).startswith(str(dest.resolve())):
+        # prevent Zip Slip: string-normalize each member against the
+        # destination prefix (no per-member filesystem resolve)
+        dest_s = os.path.realpath(dest) + os.sep
+        members = zf.infolist()
+        for member in members:
+            target = os.path.normpath(os.path.join(dest_s, member.filename))
+            # a './' entry normalizes to dest itself (no trailing sep) — allow it
+            if target != dest_s[:-1] and not target.startswith(dest_s):
                 raise RuntimeError(f"Unsafe zip member path: {member.filename}")
-        zf.extractall(dest)
+        zf.extractall(dest, members=members)
 
 def _t_keep_only(root: Path, step: Dict):
-    keep = set(_glob_paths(root, step["patterns"]))
-    for p in list(root.rglob("*")):
-        if p == root: 
-            continue
-        if any(parent in keep for parent in p.parents):
-            continue
-        if p.is_dir():
-            # delete empty dirs after pass
-            continue
-        if p not in keep:
-            p.unlink(missing_ok=True)
-    # second pass to prune empty dirs
-    for d in sorted([d for d in root.rglob("*") if d.is_dir()], reverse=True):
-        try: d.rmdir()
-        except OSError: pass
+    # String sets + one bottom-up walk: O(files) instead of materializing
+    # every Path and checking its parents chain, plus a second rglob pass.
+    keep = {str(p) for p in _glob_paths(root, step["patterns"])}
+    keep_prefixes = tuple(k + os.sep for k in keep)
+    root_s = str(root)
+    for dirpath, _dirnames, filenames in os.walk(root_s, topdown=False):
+        if dirpath in keep or dirpath.startswith(keep_prefixes):
+            continue  # kept dir (or inside one): everything below survives
+        for name in filenames:
+            fpath = os.path.join(dirpath, name)
+            if fpath not in keep and not fpath.startswith(keep_prefixes):
+                try:
+                    os.unlink(fpath)
+                except FileNotFoundError:
+                    pass
+        if dirpath != root_s:
+            try:
+                os.rmdir(dirpath)  # prunes dirs emptied by this walk
+            except OSError:
+                pass
 
 def _t_strip_prefix(root: Path, step: Dict):
     prefix = step["prefix"].rstrip("/\\")
@@ -92,7 +116,8 @@ def _t_strip_prefix(root: Path, step: Dict):
     if not src.exists():
         return
     for item in src.iterdir():
-        shutil.move(str(item), str(root / item.name))
+        # always same-FS inside root: one rename syscall per child
+        os.replace(item, root / item.name)
     # remove emptied prefix dirs
     for d in sorted([d for d in (root / prefix).rglob("*") if d.is_dir()], reverse=True):
         d.rmdir()
@@ -123,10 +148,40 @@ def _t_move(root: Path, step: Dict):
     src = root / step["from"]
     dst = root / step["to"]
     ensure_dir(dst.parent)
-    shutil.move(str(src), str(dst))
+    try:
+        os.replace(src, dst)
+    except OSError:
+        # cross-device or dir-over-dir: fall back to the generic move
+        shutil.move(str(src), str(dst))
 
 def _copy_any(src: Path, dst: Path):
     if src.is_dir():
         shutil.copytree(src, dst, dirs_exist_ok=True)
     else:
-        shutil.copy2(src, dst)
+        try:
+            # same-FS hardlink is a single metadata op with no data movement;
+            # transforms never rewrite file contents afterwards, so aliasing
+            # the inode is safe
+            os.link(src, dst)
+        except OSError:
+            _copy_file(src, dst)
+
+
+def _copy_file(src: Path, dst: Path):
+    # copy_file_range moves bytes in-kernel (and may reflink on XFS/Btrfs,
+    # skipping data movement entirely) instead of round-tripping through
+    # userspace buffers like shutil.copy2.
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if n == 0:
+                        break
+                    remaining -= n
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            pass  # e.g. cross-device or unsupported FS: use the slow path
+    shutil.copy2(src, dst)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-import json, shutil, subprocess, tempfile
+import functools, json, os, shutil, tempfile, types
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -28,8 +29,7 @@ class DatasetConfig:
     # (optional for future use)
     tasks: Optional[List[Dict[str, Any]]] = None
 
-def load_dataset_config(ref: str | Path | Dict[str, Any]) -> DatasetConfig:
-    obj = json.loads(Path(ref).read_text(encoding="utf-8")) if not isinstance(ref, dict) else ref
+def _config_from_obj(obj: Dict[str, Any]) -> DatasetConfig:
     return DatasetConfig(
         id=obj["id"],
         version=obj.get("version", "0.0.0"),
@@ -39,45 +39,77 @@ def load_dataset_config(ref: str | Path | Dict[str, Any]) -> DatasetConfig:
         tasks=obj.get("tasks"),
     )
 
+# Both caches key on (path, mtime_ns) so edits to the file invalidate the
+# entry; repeated checkouts/listings hit the parsed result instead of
+# re-reading and re-decoding JSON each call.
+
+@functools.lru_cache(maxsize=None)
+def _parse_dataset_config(path: str, mtime_ns: int) -> DatasetConfig:
+    return _config_from_obj(json.loads(Path(path).read_text(encoding="utf-8")))
+
+@functools.lru_cache(maxsize=None)
+def _parse_registry(path: str, mtime_ns: int) -> Dict[str, Any]:
+    # read-only view so callers can't mutate the shared cache entry
+    return types.MappingProxyType(json.loads(Path(path).read_text(encoding="utf-8")))
+
+def load_dataset_config(ref: str | Path | Dict[str, Any]) -> DatasetConfig:
+    if isinstance(ref, dict):
+        return _config_from_obj(ref)
+    p = Path(ref)
+    return _parse_dataset_config(str(p), p.stat().st_mtime_ns)
+
 def load_registry(registry_path: Path = REGISTRY_PATH) -> Dict[str, Any]:
-    return json.loads(registry_path.read_text(encoding="utf-8"))
+    return _parse_registry(str(registry_path), registry_path.stat().st_mtime_ns)
 
 def checkout_one(dataset_id: str, output_dir: Path, update: bool = False) -> Path:
+    dst = (output_dir / dataset_id).resolve()
+    # one lstat decides the common cache-hit path before any registry or
+    # config parsing happens
+    try:
+        os.lstat(dst)
+        present = True
+    except FileNotFoundError:
+        present = False
+    if present and not update:
+        print(f"✔ Already present: {dataset_id}")
+        return dst
+
     registry = load_registry()
     ref = registry.get(dataset_id)
     if not ref:
         raise ValueError(f"Dataset '{dataset_id}' not found in registry {REGISTRY_PATH}")
     cfg = load_dataset_config(ref)
 
-    dst = (output_dir / dataset_id).resolve()
     ensure_dir(output_dir)
 
-    if dst.exists() and not update:
-        print(f"✔ Already present: {dataset_id}")
-        return dst
-
     # stage: fetch into tmp, then transform into dst atomically
     with tempfile.TemporaryDirectory(prefix="arena_") as tmpdir:
         tmp = Path(tmpdir)
         src_root = _fetch_source(cfg.source, tmp)
-        # copy fetched content to a working dir so transforms don’t mutate the clone directly
-        workdir = tmp / "work"
-        shutil.copytree(src_root, workdir)
-        apply_transforms(workdir, cfg.transforms)
+        # transform the clone in place — the tmpdir is discarded anyway, so
+        # there is no point copying the whole tree just to protect it
+        apply_transforms(src_root, cfg.transforms)
 
         # replace destination atomically
-        if dst.exists():
+        if present:
             safe_rmtree(dst)
-        shutil.move(str(workdir), str(dst))
+        shutil.move(str(src_root), str(dst))
 
     print(f"⬇ Downloaded: {dataset_id} → {dst}")
     return dst
 
-def checkout_many(ids: List[str], output_dir: str = "datasets", update: bool = False) -> None:
+def checkout_many(ids: List[str], output_dir: str = "datasets", update: bool = False, jobs: int = 8) -> None:
     base = Path(output_dir).resolve()
     ensure_dir(base)
-    for i in ids:
-        checkout_one(i if "/" in i else f"benchmark-tasks/{i}", base, update=update)
+    # dedupe after normalizing: duplicate ids would race each other and the
+    # loser's move would land inside the winner's checkout
+    norm = list(dict.fromkeys(i if "/" in i else f"benchmark-tasks/{i}" for i in ids))
+    # Checkouts are independent clone subprocesses (network/disk bound), so
+    # run them in a thread pool; wall time drops from sum to max.
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(norm)))) as pool:
+        futures = [pool.submit(checkout_one, i, base, update=update) for i in norm]
+        for f in futures:
+            f.result()  # re-raise the first failure
 
 def list_available(output_dir: str = "datasets") -> None:
     base = Path(output_dir).resolve()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import os
 import random
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -29,11 +30,12 @@ def _normalize_dataset_id(dataset_id: str) -> str:
     return dataset_id if "/" in dataset_id else f"benchmark-tasks/{dataset_id}"
 
 
-def _maybe_rel(base: Path, s: Optional[str]) -> Optional[Path]:
+def _maybe_rel(base_abs: str, s: Optional[str]) -> Optional[Path]:
     if not s:
         return None
-    p = Path(s)
-    return p if p.is_absolute() else (base / p).resolve()
+    # pure-string join against the pre-resolved root: no per-call stat, and
+    # no symlink canonicalization leaking the real store path into prompts
+    return Path(s) if os.path.isabs(s) else Path(os.path.normpath(os.path.join(base_abs, s)))
 
 
 def _parse_tasks(obj: Any, dataset_root: Path) -> List[TaskSpec]:
@@ -46,12 +48,13 @@ def _parse_tasks(obj: Any, dataset_root: Path) -> List[TaskSpec]:
     else:
         raise ValueError("Manifest must be a JSON array or an object with a 'tasks' array")
 
+    base_abs = str(dataset_root.resolve())  # resolve once, not twice per task
     out: List[TaskSpec] = []
     for t in raw:
         tid = str(t.get("id") or t.get("name") or f"task-{len(out)+1}")
         instr = t.get("instruction") or f"Run benchmark task '{tid}'."
-        inp = _maybe_rel(dataset_root, t.get("input"))
-        ans = _maybe_rel(dataset_root, t.get("answer"))
+        inp = _maybe_rel(base_abs, t.get("input"))
+        ans = _maybe_rel(base_abs, t.get("answer"))
         meta = {k: v for k, v in t.items() if k not in {"id", "name", "instruction", "input", "answer"}}
         out.append(TaskSpec(tid, instr, inp, ans, meta))
     return out
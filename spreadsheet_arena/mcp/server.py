@@ -53,11 +53,15 @@ class ServerHandle:
             )
 
     def stop(self, join_timeout: float = 5) -> None:
-        """Stop the MCP server and join its thread."""
+        """Stop the MCP server, flush the results log, and join its thread."""
         try:
             self.mcp.stop()
         except Exception:
             pass
+        try:
+            self.tasks.close()
+        except Exception:
+            pass
         self.thread.join(timeout=join_timeout)
 
 
@@ -3,6 +3,9 @@ from __future__ import annotations
 from dataclasses import dataclass, asdict
 from pathlib import Path
 from typing import Callable, Dict, List, Optional, Any
+import asyncio
+import collections
+import json
 import threading
 import time
 
@@ -19,6 +22,18 @@ class QueueItem:
     finished_at: Optional[float] = None
     result: Optional[Dict[str, Any]] = None
 
+    def __post_init__(self):
+        # Lease payload is immutable per spec, so build it once here rather
+        # than on every next_task call. Don't leak answer_path to the agent;
+        # keep that server-side. Treat as read-only.
+        self._payload: Dict[str, Any] = {
+            "task_id": self.id,
+            "id": self.spec.id,
+            "instruction": self.spec.instruction,
+            "input": str(self.spec.input_path) if self.spec.input_path else None,
+            "meta": self.spec.meta,
+        }
+
 
 class TaskQueue:
     """
@@ -31,36 +46,60 @@ class TaskQueue:
         results_dir: Path | str = "results",
         grader: Optional[Callable[[TaskSpec, Path], Dict[str, Any]]] = None,
         log_progress: bool = False,
+        verbose_results: bool = False,
     ):
         self._items = [QueueItem(id=i, spec=s) for i, s in enumerate(specs)]
+        # FIFO of indices still pending — popleft gives O(1) leases and
+        # O(1) pending counts instead of scanning _items each call
+        self._pending = collections.deque(range(len(self._items)))
         self._lock = threading.Lock()
         self._in_progress: set[int] = set()
         self._completed = 0
+        # Completion signals for wait_for_all_completed; each waiter binds
+        # an event to its own loop since submissions arrive from the server
+        # thread and several callers may wait concurrently.
+        self._done_waiters: List[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
         self._results_dir = Path(results_dir)
         self._results_dir.mkdir(parents=True, exist_ok=True)
         self._grader = grader
         self.log_progress = log_progress
+        self.verbose_results = verbose_results
+        # One buffered append-only log instead of a file per task; the
+        # per-task pretty-printed files remain behind verbose_results.
+        self._results_fp = open(
+            self._results_dir / "results.jsonl", "a", buffering=1 << 16, encoding="utf-8"
+        )
 
     # ---------- public API for server/CLI ----------
     def pending_count(self) -> int:
         with self._lock:
-            return sum(1 for it in self._items if it.status == "pending")
+            return len(self._pending)
 
     def completed_count(self) -> int:
         with self._lock:
             return self._completed
 
     async def wait_for_all_completed(self, timeout_seconds: int | None = None):
-        import asyncio
-        start = time.time()
-        while True:
-            with self._lock:
-                done = self._completed == len(self._items)
-            if done:
+        with self._lock:
+            if self._completed == len(self._items):
                 return
-            if timeout_seconds is not None and (time.time() - start) > timeout_seconds:
-                raise TimeoutError("wait_for_all_completed timed out")
-            await asyncio.sleep(0.1)
+            waiter = (asyncio.get_running_loop(), asyncio.Event())
+            self._done_waiters.append(waiter)
+        # No polling: submit_answer signals the event thread-safely, so the
+        # waiter wakes within a loop tick of the final submission.
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout_seconds)
+        finally:
+            with self._lock:
+                if waiter in self._done_waiters:
+                    self._done_waiters.remove(waiter)
+
+    def close(self) -> None:
+        """Flush and close the results log. Safe to call more than once."""
+        with self._lock:
+            if not self._results_fp.closed:
+                self._results_fp.flush()
+                self._results_fp.close()
 
     # ---------- exposed to MCP tools (via wrapper below) ----------
     def next_task(self) -> Optional[Dict[str, Any]]:
@@ -68,73 +107,97 @@ class TaskQueue:
         Lease the next pending task. Returns a JSON-serializable dict or None when exhausted.
         """
         with self._lock:
-            for it in self._items:
-                if it.status == "pending":
-                    it.status = "in_progress"
-                    it.started_at = time.time()
-                    self._in_progress.add(it.id)
-                    if self.log_progress:
-                        print(f"[queue] leasing task {it.id}: {it.spec.id or ''}")
-                    # Don't leak answer_path to the agent; keep that server-side
-                    return {
-                        "task_id": it.id,
-                        "id": it.spec.id,
-                        "instruction": it.spec.instruction,
-                        "input": str(it.spec.input_path) if it.spec.input_path else None,
-                        "meta": it.spec.meta,
-                    }
-        return None
+            return self._next_task_locked()
 
     def submit_answer(self, task_id: int, output_path: str | None = None) -> Dict[str, Any]:
         """
         Submit/grade an answer for a leased task.
         """
-        p_out = Path(output_path) if output_path else None
         with self._lock:
-            if task_id < 0 or task_id >= len(self._items):
-                raise ValueError(f"Unknown task_id {task_id}")
-            it = self._items[task_id]
-            if it.status != "in_progress":
-                raise RuntimeError(f"Task {task_id} not in progress (status={it.status})")
-
-            # Optional grading
-            grade: Dict[str, Any] = {}
-            if self._grader and p_out:
-                try:
-                    grade = self._grader(it.spec, p_out)
-                except Exception as e:
-                    grade = {"status": "grading_error", "error": str(e)}
-
-            # Persist a small record
-            rec = {
-                "task_id": it.id,
-                "spec_id": it.spec.id,
-                "output_path": str(p_out) if p_out else None,
-                "grade": grade or None,
-                "submitted_at": time.time(),
-            }
+            return self._submit_answer_locked(task_id, output_path)
+
+    def submit_and_next(self, task_id: int, output_path: str | None = None) -> Dict[str, Any]:
+        """
+        Submit one task and lease the next under a single lock acquisition.
+        Halves round-trips (and lock traffic) versus separate calls.
+        """
+        with self._lock:
+            submitted = self._submit_answer_locked(task_id, output_path)
+            return {"submitted": submitted, "next": self._next_task_locked()}
+
+    # ---------- lock-held internals ----------
+    def _next_task_locked(self) -> Optional[Dict[str, Any]]:
+        while self._pending:
+            it = self._items[self._pending.popleft()]
+            if it.status != "pending":
+                continue
+            it.status = "in_progress"
+            it.started_at = time.time()
+            self._in_progress.add(it.id)
+            if self.log_progress:
+                print(f"[queue] leasing task {it.id}: {it.spec.id or ''}")
+            return it._payload
+        return None
+
+    def _submit_answer_locked(self, task_id: int, output_path: str | None = None) -> Dict[str, Any]:
+        p_out = Path(output_path) if output_path else None
+        if task_id < 0 or task_id >= len(self._items):
+            raise ValueError(f"Unknown task_id {task_id}")
+        it = self._items[task_id]
+        if it.status != "in_progress":
+            raise RuntimeError(f"Task {task_id} not in progress (status={it.status})")
+
+        # Optional grading
+        grade: Dict[str, Any] = {}
+        if self._grader and p_out:
+            try:
+                grade = self._grader(it.spec, p_out)
+            except Exception as e:
+                grade = {"status": "grading_error", "error": str(e)}
+
+        # Persist a small record; one clock read serves both timestamps
+        now = time.time()
+        rec = {
+            "task_id": it.id,
+            "spec_id": it.spec.id,
+            "output_path": str(p_out) if p_out else None,
+            "grade": grade or None,
+            "submitted_at": now,
+        }
+        self._results_fp.write(json.dumps(rec, separators=(",", ":")) + "\n")
+        # flush per record: submissions are the run's output and must survive
+        # a crash; one ~200-byte flush is noise next to the work per task
+        self._results_fp.flush()
+        if self.verbose_results:
             (self._results_dir / f"task_{it.id:05d}.json").write_text(
-                __import__("json").dumps(rec, indent=2), encoding="utf-8"
+                json.dumps(rec, indent=2), encoding="utf-8"
             )
 
-            # Mark completed
-            it.status = "completed"
-            it.finished_at = time.time()
-            it.result = rec
-            self._in_progress.discard(it.id)
-            self._completed += 1
+        # Mark completed
+        it.status = "completed"
+        it.finished_at = now
+        it.result = rec
+        self._in_progress.discard(it.id)
+        self._completed += 1
+        if self._completed == len(self._items):
+            for loop, event in self._done_waiters:
+                try:
+                    loop.call_soon_threadsafe(event.set)
+                except RuntimeError:
+                    pass  # waiter's loop already closed (e.g. timed-out wait)
 
-            if self.log_progress:
-                print(f"[queue] completed task {it.id}")
+        if self.log_progress:
+            print(f"[queue] completed task {it.id}")
 
-            return {"ok": True, "grade": grade or None, "completed": self._completed, "total": len(self._items)}
+        return {"ok": True, "grade": grade or None, "completed": self._completed, "total": len(self._items)}
 
 
 def get_task_queue_mcp(queue: TaskQueue) -> FastMCP:
     """
-    Two tools:
+    Three tools:
       - next_task() -> { task_id, id, instruction, input, meta } | null
       - submit_answer(task_id, output_path) -> { ok, grade?, completed, total }
+      - submit_and_next(task_id, output_path) -> { submitted, next }
     """
     mcp = FastMCP("SpreadsheetArena")
 
@@ -151,6 +214,15 @@ def get_task_queue_mcp(queue: TaskQueue) -> FastMCP:
         """
         return queue.submit_answer(task_id, output_path)
 
+    @mcp.tool()
+    def submit_and_next(task_id: int, output_path: str | None = None) -> dict:
+        """
+        Submit results for the current task and lease the next one in a
+        single call. Prefer this over separate submit_answer + next_task
+        calls; 'next' is null when no tasks remain.
+        """
+        return queue.submit_and_next(task_id, output_path)
+
     @mcp.prompt()
     def complete_tasks_prompt():
         """Generate a prompt for completing the tasks."""